@@ -4,7 +4,7 @@ Simple Excel Analyzer - Direct openpyxl implementation
 
 import warnings
 import openpyxl
-from openpyxl.utils import get_column_letter
+from openpyxl.utils import get_column_letter, column_index_from_string
 # Suppress the Slicer List extension warning which is benign
 warnings.filterwarnings('ignore', message='Slicer List extension is not supported and will be removed', category=UserWarning)
 from pathlib import Path
@@ -18,6 +18,7 @@ import tempfile
 # import psutil  # Not available in this environment
 import threading
 from collections import defaultdict, Counter
+from bisect import bisect_left
 from statistics import mean, median, stdev
 import json
 import logging
@@ -25,6 +26,76 @@ from logging.handlers import RotatingFileHandler
 
 from .config_manager import ConfigManager
 
+# Excel error literals; the regex drives substring checks, the set exact matches
+_EXCEL_ERROR_VALUES = ('#N/A', '#ERROR', '#REF!', '#VALUE!', '#DIV/0!', '#NAME?', '#NUM!', '#NULL!')
+_EXCEL_ERROR_VALUE_SET = frozenset(_EXCEL_ERROR_VALUES)
+# Any of the error literals anywhere in a string, matched in one case-insensitive scan
+_EXCEL_ERROR_SEARCH = re.compile('|'.join(map(re.escape, _EXCEL_ERROR_VALUES)), re.IGNORECASE)
+
+# Workbook format description by file extension
+_EXCEL_VERSIONS = {
+    '.xlsx': '2007+',
+    '.xlsm': '2007+ (Macro-enabled)',
+    '.xlsb': '2007+ (Binary)',
+    '.xls': '97-2003',
+    '.xlt': '97-2003 (Template)',
+    '.xltx': '2007+ (Template)',
+    '.xltm': '2007+ (Macro Template)'
+}
+
+# Common date layouts recognised at the start of a string cell
+_DATE_STRING_PATTERNS = (
+    re.compile(r'\d{1,2}[/-]\d{1,2}[/-]\d{2,4}'),  # MM/DD/YYYY or DD/MM/YYYY
+    re.compile(r'\d{4}[/-]\d{1,2}[/-]\d{1,2}'),    # YYYY/MM/DD
+    re.compile(r'\d{1,2}[/-]\w{3}[/-]\d{2,4}'),    # DD/MMM/YYYY
+)
+
+# Sensitive-data detectors applied to sampled column values
+_SENSITIVE_DATA_PATTERNS = {
+    'email_addresses': re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'),
+    'ssn_numbers': re.compile(r'\b\d{3}-\d{2}-\d{4}\b|\b\d{9}\b'),
+    'credit_cards': re.compile(r'\b(?:\d{4}[-\s]?){3}\d{4}\b'),
+    'phone_numbers': re.compile(r'\b\(?\d{3}\)?[-\s]?\d{3}[-\s]?\d{4}\b'),
+    'financial_amounts': re.compile(r'\$[\d,]+\.?\d*'),
+    'account_numbers': re.compile(r'\b\d{8,}\b')
+}
+
+# Sheet-qualified reference in a formula, e.g. Sheet1! or 'My Sheet'!
+_SHEET_REF_PATTERN = re.compile(r"'?([A-Za-z0-9 _]+)'?!")
+
+# Bracketed external workbook name in a formula, e.g. [Book2.xlsx]
+_EXTERNAL_WORKBOOK_PATTERN = re.compile(r'\[([^\]]+)\]')
+
+# Risk weight per sensitive-data pattern; unlisted patterns weigh 1.0
+_SENSITIVE_RISK_WEIGHTS = {
+    'ssn_numbers': 3.0,
+    'credit_cards': 3.0,
+    'account_numbers': 2.0,
+    'email_addresses': 1.0,
+    'phone_numbers': 1.0,
+    'financial_amounts': 0.5
+}
+
+# Header substrings that mark a shared column as a likely join key
+_KEY_COLUMN_PATTERNS = ('id', 'key', 'code', 'number', 'name', 'contractor', 'client')
+
+# Sheet size classes by cell count: <=10k Small, <=100k Medium, above that Large
+_SHEET_SIZE_THRESHOLDS = (10000, 100000)
+_SHEET_SIZE_CLASSES = ('Small', 'Medium', 'Large')
+
+# Currency/grouping characters stripped before parsing a numeric string
+_NUMERIC_STRIP_TABLE = str.maketrans('', '', ',$%')
+
+# Upper bound on distinct strings remembered by _detect_enhanced_cell_type
+_STRING_TYPE_CACHE_SIZE = 4096
+
+# Log level and label for each progress status; unknown statuses log as INFO
+_PROGRESS_LOG_LEVELS = {
+    'starting': (logging.INFO, 'STARTING'),
+    'complete': (logging.INFO, 'COMPLETE'),
+    'error': (logging.ERROR, 'ERROR'),
+}
+
 
 class SimpleExcelAnalyzer:
     """Streamlined Excel analysis without framework complexity"""
@@ -34,6 +105,8 @@ class SimpleExcelAnalyzer:
         self.config_manager = ConfigManager()
         self.config: Dict[str, Any] = self.config_manager.load_config(config_path)
         self.analysis_logger = self._setup_logger()
+        # Repeated text values (categories, codes) skip the regex/float checks
+        self._string_type_cache: Dict[str, str] = {}
     
     def _setup_logger(self) -> logging.Logger:
         """Setup logger for analysis operations"""
@@ -76,9 +149,9 @@ class SimpleExcelAnalyzer:
         start_time = time.time()
         
         # Log analysis start
-        self.analysis_logger.info(f"{'='*80}")
-        self.analysis_logger.info(f"Starting analysis of file: {file_path}")
-        self.analysis_logger.info(f"File size: {os.path.getsize(file_path) / (1024*1024):.2f} MB")
+        self.analysis_logger.info("%s", "=" * 80)
+        self.analysis_logger.info("Starting analysis of file: %s", file_path)
+        self.analysis_logger.info("File size: %.2f MB", os.path.getsize(file_path) / (1024*1024))
         
         try:
             module_statuses: Dict[str, str] = {}
@@ -140,6 +213,8 @@ class SimpleExcelAnalyzer:
             _safe_run("doc_synthesizer", "Generating documentation", lambda: None)
             
             wb.close()
+            # Drop the reference so the closed workbook's cells and shared strings can be freed
+            self.wb = None
             
             # Compile results
             results = self._compile_results(
@@ -153,23 +228,24 @@ class SimpleExcelAnalyzer:
             
             # Log analysis completion
             total_time = time.time() - start_time
-            self.analysis_logger.info(f"Analysis completed successfully in {self._format_duration(total_time)}")
-            self.analysis_logger.info(f"Modules executed: {results['execution_summary']['successful_modules']}/{results['execution_summary']['total_modules']}")
-            self.analysis_logger.info(f"Total module time: {self._format_duration(results['execution_summary']['total_module_time'])}")
+            self.analysis_logger.info("Analysis completed successfully in %s", self._format_duration(total_time))
+            self.analysis_logger.info("Modules executed: %s/%s", results['execution_summary']['successful_modules'], results['execution_summary']['total_modules'])
+            self.analysis_logger.info("Total module time: %s", self._format_duration(results['execution_summary']['total_module_time']))
             
             # Log summary of findings
             self.analysis_logger.info("Analysis Summary:")
-            self.analysis_logger.info(f"  - Sheets: {results['file_info']['sheet_count']}")
-            self.analysis_logger.info(f"  - Quality Score: {results['analysis_metadata']['quality_score']:.1%}")
-            self.analysis_logger.info(f"  - Security Score: {results['analysis_metadata']['security_score']:.1f}/10")
-            self.analysis_logger.info(f"{'='*80}")
+            self.analysis_logger.info("  - Sheets: %s", results['file_info']['sheet_count'])
+            self.analysis_logger.info("  - Quality Score: %.1f%%", results['analysis_metadata']['quality_score'] * 100)
+            self.analysis_logger.info("  - Security Score: %.1f/10", results['analysis_metadata']['security_score'])
+            self.analysis_logger.info("%s", "=" * 80)
             
             return results
             
         except Exception as e:
-            self.analysis_logger.error(f"Analysis failed: {str(e)}")
+            self.analysis_logger.error("Analysis failed: %s", e)
             if 'wb' in locals():
                 wb.close()
+            self.wb = None
             raise Exception(f"Analysis failed: {str(e)}")
     
     def _update_progress(self, module: str, status: str, detail: str = ""):
@@ -178,14 +254,8 @@ class SimpleExcelAnalyzer:
             self.progress_callback(module, status, detail)
         
         # Log the progress
-        if status == "starting":
-            self.analysis_logger.info(f"Module {module}: STARTING - {detail}")
-        elif status == "complete":
-            self.analysis_logger.info(f"Module {module}: COMPLETE - {detail}")
-        elif status == "error":
-            self.analysis_logger.error(f"Module {module}: ERROR - {detail}")
-        else:
-            self.analysis_logger.info(f"Module {module}: {status} - {detail}")
+        level, label = _PROGRESS_LOG_LEVELS.get(status, (logging.INFO, status))
+        self.analysis_logger.log(level, "Module %s: %s - %s", module, label, detail)
     
     def _format_duration(self, seconds: float) -> str:
         """Format duration in human-readable format"""
@@ -269,16 +339,7 @@ class SimpleExcelAnalyzer:
     def _detect_excel_version(self, path: Path) -> str:
         """Detect Excel version based on file extension"""
         suffix = path.suffix.lower()
-        version_map = {
-            '.xlsx': '2007+',
-            '.xlsm': '2007+ (Macro-enabled)',
-            '.xlsb': '2007+ (Binary)',
-            '.xls': '97-2003',
-            '.xlt': '97-2003 (Template)',
-            '.xltx': '2007+ (Template)',
-            '.xltm': '2007+ (Macro Template)'
-        }
-        return version_map.get(suffix, 'Unknown')
+        return _EXCEL_VERSIONS.get(suffix, 'Unknown')
     
     def _calculate_compression_ratio(self, file_path: str) -> float:
         """Calculate compression ratio for xlsx files"""
@@ -289,8 +350,11 @@ class SimpleExcelAnalyzer:
             
             # xlsx files are ZIP archives
             with zipfile.ZipFile(file_path, 'r') as zip_file:
-                compressed_size = sum(info.compress_size for info in zip_file.infolist())
-                uncompressed_size = sum(info.file_size for info in zip_file.infolist())
+                compressed_size = 0
+                uncompressed_size = 0
+                for info in zip_file.infolist():
+                    compressed_size += info.compress_size
+                    uncompressed_size += info.file_size
                 
                 if uncompressed_size == 0:
                     return 0.0
@@ -353,8 +417,8 @@ class SimpleExcelAnalyzer:
         
         return {
             'total_sheets': len(wb.sheetnames),
-            'visible_sheets': [ws.title for ws in wb.worksheets if getattr(ws, 'sheet_state', 'visible') == 'visible'],
-            'hidden_sheets': [ws.title for ws in wb.worksheets if getattr(ws, 'sheet_state', 'visible') != 'visible'],
+            'visible_sheets': visible_sheets,
+            'hidden_sheets': hidden_sheets,
             'sheet_details': sheet_details,
             'named_ranges_count': named_ranges_info['count'],
             'named_ranges_list': named_ranges_info['ranges'],
@@ -371,12 +435,7 @@ class SimpleExcelAnalyzer:
             return 'Empty'
         
         cell_count = ws.max_row * ws.max_column
-        if cell_count > 100000:  # 100k cells
-            return 'Large'
-        elif cell_count > 10000:  # 10k cells
-            return 'Medium'
-        else:
-            return 'Small'
+        return _SHEET_SIZE_CLASSES[bisect_left(_SHEET_SIZE_THRESHOLDS, cell_count)]
     
     def _detect_workbook_features(self, wb) -> Dict[str, Any]:
         """Detect various workbook features"""
@@ -436,9 +495,10 @@ class SimpleExcelAnalyzer:
             except:
                 pass
             
-            # Comments
+            # Comments (read-only cells carry no comments, so skip opening the sheet stream)
             try:
-                for row in ws.iter_rows():
+                rows = () if getattr(wb, 'read_only', False) else ws.iter_rows()
+                for row in rows:
                     for cell in row:
                         if cell.comment:
                             features['comments_count'] += 1
@@ -550,6 +610,10 @@ class SimpleExcelAnalyzer:
             'data_lineage': []
         }
         
+        analysis_config = self.config.get('analysis', {})
+        configured_sample_rows = analysis_config.get('sample_rows', 100)
+        max_stream_rows = analysis_config.get('max_sample_rows', 1000)
+        
         for ws in wb.worksheets:
             if not ws.max_row or not ws.max_column:
                 sheet_data[ws.title] = {
@@ -572,7 +636,7 @@ class SimpleExcelAnalyzer:
             total_cells += sheet_cells
             
             # Enhanced sampling strategy
-            sample_rows = min(self.config.get('analysis', {}).get('sample_rows', 100), ws.max_row)
+            sample_rows = min(configured_sample_rows, ws.max_row)
             
             # For very large sheets, be more conservative but still get good coverage
             if ws.max_row > 100000 or ws.max_column > 100:
@@ -583,8 +647,11 @@ class SimpleExcelAnalyzer:
             # Comprehensive header analysis
             header_map = self._extract_sheet_headers(ws)
             
+            # Read the sampled body rows once; quality and duplicate checks share them
+            sample_body = list(ws.iter_rows(min_row=2, max_row=min(ws.max_row, sample_rows+1), values_only=True))
+            
             # Enhanced data quality metrics
-            quality_map = self._calculate_enhanced_data_quality(ws, sample_rows)
+            quality_map = self._calculate_enhanced_data_quality(ws, sample_rows, rows=sample_body)
             
             # Advanced column statistics with timeout protection
             retry_rows = sample_rows
@@ -603,8 +670,7 @@ class SimpleExcelAnalyzer:
                         raise
             
             # Update overall data type distribution
-            for data_type, count in type_distribution.items():
-                overall_data_types[data_type] += count
+            overall_data_types.update(type_distribution)
             
             # Enhanced column analysis
             columns_summary = []
@@ -645,7 +711,7 @@ class SimpleExcelAnalyzer:
             sheet_metrics = self._calculate_sheet_metrics(ws, columns_summary, quality_map)
             
             # Duplicate row detection
-            duplicate_info = self._detect_duplicate_rows(ws, sample_rows)
+            duplicate_info = self._detect_duplicate_rows(ws, sample_rows, rows=sample_body)
             
             sheet_data[ws.title] = {
                 'dimensions': f"{ws.max_row}x{ws.max_column}",
@@ -659,7 +725,7 @@ class SimpleExcelAnalyzer:
                 'columns': sorted(columns_summary, key=lambda c: c['number']),
                 'data_quality_metrics': sheet_metrics,
                 'duplicate_rows': duplicate_info,
-                'stream_stats': self._analyze_data_streaming(ws, self.config.get('analysis', {}).get('max_sample_rows', 1000)) if ws.max_row > sample_rows else {}
+                'stream_stats': self._analyze_data_streaming(ws, max_stream_rows) if ws.max_row > sample_rows else {}
             }
             
             # Collect potential relationship keys
@@ -682,8 +748,8 @@ class SimpleExcelAnalyzer:
     # ------------------------------------------------------------------
     # Task 1: Header extraction helper
     # ------------------------------------------------------------------
-    def _calculate_enhanced_data_quality(self, ws, sample_rows=100):
-        """Enhanced data quality analysis with comprehensive metrics"""
+    def _calculate_enhanced_data_quality(self, ws, sample_rows=100, rows: Optional[List[tuple]] = None):
+        """Enhanced data quality analysis; `rows` reuses sample rows already read from ws"""
         col_data = defaultdict(lambda: {
             'nulls': 0,
             'values': set(),
@@ -692,24 +758,27 @@ class SimpleExcelAnalyzer:
             'outliers': []
         })
         
+        if rows is None:
+            rows = ws.iter_rows(min_row=2, max_row=min(ws.max_row, sample_rows+1), values_only=True)
+        
         rows_checked = 0
-        for row in ws.iter_rows(min_row=2, max_row=min(ws.max_row, sample_rows+1), values_only=True):
+        for row in rows:
             rows_checked += 1
             for idx, value in enumerate(row, start=1):
                 letter = get_column_letter(idx)
-                
+                data = col_data[letter]
                 if value in (None, "", " "):
-                    col_data[letter]['nulls'] += 1
+                    data['nulls'] += 1
                 else:
-                    col_data[letter]['values'].add(value)
+                    data['values'].add(value)
                     
                     # Collect numeric values for outlier detection
                     if isinstance(value, (int, float)):
-                        col_data[letter]['numeric_values'].append(value)
+                        data['numeric_values'].append(value)
                     
                     # Check for data quality issues
                     if self._is_data_quality_issue(value):
-                        col_data[letter]['issues'] += 1
+                        data['issues'] += 1
         
         quality = {}
         for letter, data in col_data.items():
@@ -738,8 +807,7 @@ class SimpleExcelAnalyzer:
         """Check if a value represents a data quality issue"""
         if isinstance(value, str):
             # Check for common data quality issues
-            issues = ['#N/A', '#ERROR', '#REF!', '#VALUE!', '#DIV/0!', '#NAME?', '#NUM!', '#NULL!']
-            return any(issue in str(value).upper() for issue in issues)
+            return _EXCEL_ERROR_SEARCH.search(value) is not None
         return False
     
     def _detect_outliers(self, values: List[float]) -> List[float]:
@@ -748,8 +816,9 @@ class SimpleExcelAnalyzer:
             if len(values) < 5:
                 return []
             
-            q1 = sorted(values)[len(values) // 4]
-            q3 = sorted(values)[3 * len(values) // 4]
+            ordered = sorted(values)
+            q1 = ordered[len(ordered) // 4]
+            q3 = ordered[3 * len(ordered) // 4]
             iqr = q3 - q1
             
             lower_bound = q1 - 1.5 * iqr
@@ -774,26 +843,42 @@ class SimpleExcelAnalyzer:
         if not columns_summary:
             return {}
         
-        fill_rates = [col['fill_rate'] for col in columns_summary]
-        consistency_scores = [col['consistency_score'] for col in columns_summary]
+        # One walk over the columns collects everything the metrics need
+        fill_rates = []
+        consistency_scores = []
+        columns_with_issues = 0
+        total_quality_issues = 0
+        headers_present = 0
+        for col in columns_summary:
+            fill_rates.append(col['fill_rate'])
+            consistency_scores.append(col['consistency_score'])
+            issues = col['data_quality_issues']
+            if issues > 0:
+                columns_with_issues += 1
+            total_quality_issues += issues
+            if not col['header_missing']:
+                headers_present += 1
         
         return {
-            'average_fill_rate': mean(fill_rates) if fill_rates else 0.0,
-            'min_fill_rate': min(fill_rates) if fill_rates else 0.0,
-            'max_fill_rate': max(fill_rates) if fill_rates else 0.0,
-            'average_consistency': mean(consistency_scores) if consistency_scores else 0.0,
-            'columns_with_issues': sum(1 for col in columns_summary if col['data_quality_issues'] > 0),
-            'total_quality_issues': sum(col['data_quality_issues'] for col in columns_summary),
-            'header_consistency': sum(1 for col in columns_summary if not col['header_missing']) / len(columns_summary) if columns_summary else 0.0
+            'average_fill_rate': mean(fill_rates),
+            'min_fill_rate': min(fill_rates),
+            'max_fill_rate': max(fill_rates),
+            'average_consistency': mean(consistency_scores),
+            'columns_with_issues': columns_with_issues,
+            'total_quality_issues': total_quality_issues,
+            'header_consistency': headers_present / len(columns_summary)
         }
     
-    def _detect_duplicate_rows(self, ws, sample_rows: int) -> Dict[str, Any]:
-        """Detect duplicate rows in the sheet"""
+    def _detect_duplicate_rows(self, ws, sample_rows: int, rows: Optional[List[tuple]] = None) -> Dict[str, Any]:
+        """Detect duplicate rows in the sheet; `rows` reuses sample rows already read from ws"""
         seen_rows = set()
         duplicate_count = 0
         
         try:
-            for row in ws.iter_rows(min_row=2, max_row=min(ws.max_row, sample_rows+1), values_only=True):
+            if rows is None:
+                rows = ws.iter_rows(min_row=2, max_row=min(ws.max_row, sample_rows+1), values_only=True)
+            for row in rows:
+                # Stringified key: 1, 1.0 and True stay distinct, None matches ''
                 row_tuple = tuple(str(cell) if cell is not None else '' for cell in row)
                 if row_tuple in seen_rows:
                     duplicate_count += 1
@@ -865,26 +950,33 @@ class SimpleExcelAnalyzer:
             
             for col_idx, value in enumerate(row, start=1):
                 letter = get_column_letter(col_idx)
-                stats = column_stats.setdefault(letter, {
-                    'numeric': 0,
-                    'date': 0,
-                    'text': 0,
-                    'boolean': 0,
-                    'blank': 0,
-                    'formula': 0,
-                    'error': 0
-                })
+                # Only build the counter dict the first time a column is seen
+                stats = column_stats.get(letter)
+                if stats is None:
+                    stats = column_stats[letter] = {
+                        'numeric': 0,
+                        'date': 0,
+                        'text': 0,
+                        'boolean': 0,
+                        'blank': 0,
+                        'formula': 0,
+                        'error': 0
+                    }
 
                 if value in (None, "", " "):
                     stats['blank'] += 1
-                    overall_type_distribution['blank'] += 1
                 else:
                     data_cells_sampled += 1
                     
                     # Enhanced type detection
                     cell_type = self._detect_enhanced_cell_type(value)
                     stats[cell_type] += 1
-                    overall_type_distribution[cell_type] += 1
+
+        # Sheet-level distribution is the sum of the per-column counters
+        for stats in column_stats.values():
+            for cell_type, count in stats.items():
+                if count:
+                    overall_type_distribution[cell_type] += count
 
         return column_stats, data_cells_sampled, overall_type_distribution
     
@@ -892,41 +984,43 @@ class SimpleExcelAnalyzer:
         """Enhanced cell type detection with more categories"""
         if value is None:
             return 'blank'
-        if value == "" or (isinstance(value, str) and value.strip() == ""):
-            return 'blank'
+        # Numbers dominate most sheets, so test them first; bool is an int
+        # subclass and has always been counted as numeric here
         if isinstance(value, (int, float)):
             return 'numeric'
-        elif isinstance(value, datetime):
+        if isinstance(value, str):
+            cached = self._string_type_cache.get(value)
+            if cached is None:
+                cached = self._classify_string(value)
+                if len(self._string_type_cache) < _STRING_TYPE_CACHE_SIZE:
+                    self._string_type_cache[value] = cached
+            return cached
+        if isinstance(value, datetime):
             return 'date'
-        elif isinstance(value, bool):
-            return 'boolean'
-        elif isinstance(value, str):
-            # Check for formula
-            if value.startswith('='):
-                return 'formula'
-            # Check for error values
-            if value.upper() in ['#N/A', '#ERROR', '#REF!', '#VALUE!', '#DIV/0!', '#NAME?', '#NUM!', '#NULL!']:
-                return 'error'
-            # Check if it's a date string
-            if self._is_date_string(value):
-                return 'date'
-            # Check if it's a numeric string
-            if self._is_numeric_string(value):
-                return 'numeric'
-            return 'text'
-        else:
-            return 'text'
+        return 'text'
+    
+    def _classify_string(self, value: str) -> str:
+        """Type category for a string cell value"""
+        if value.strip() == "":
+            return 'blank'
+        # Check for formula
+        if value.startswith('='):
+            return 'formula'
+        # Check for error values
+        if value.upper() in _EXCEL_ERROR_VALUE_SET:
+            return 'error'
+        # Check if it's a date string
+        if self._is_date_string(value):
+            return 'date'
+        # Check if it's a numeric string
+        if self._is_numeric_string(value):
+            return 'numeric'
+        return 'text'
     
     def _is_date_string(self, value: str) -> bool:
         """Check if string represents a date"""
         try:
-            # Common date patterns
-            date_patterns = [
-                r'\d{1,2}[/-]\d{1,2}[/-]\d{2,4}',  # MM/DD/YYYY or DD/MM/YYYY
-                r'\d{4}[/-]\d{1,2}[/-]\d{1,2}',    # YYYY/MM/DD
-                r'\d{1,2}[/-]\w{3}[/-]\d{2,4}',    # DD/MMM/YYYY
-            ]
-            return any(re.match(pattern, value) for pattern in date_patterns)
+            return any(pattern.match(value) for pattern in _DATE_STRING_PATTERNS)
         except:
             return False
     
@@ -935,7 +1029,7 @@ class SimpleExcelAnalyzer:
         if not value or not isinstance(value, str):
             return False
         try:
-            cleaned = value.replace(',', '').replace('$', '').replace('%', '').strip()
+            cleaned = value.translate(_NUMERIC_STRIP_TABLE).strip()
             if not cleaned:
                 return False
             float(cleaned)
@@ -945,10 +1039,7 @@ class SimpleExcelAnalyzer:
     
     def _column_letter_to_number(self, letter: str) -> int:
         """Convert Excel column letter(s) to column number (A=1, B=2, ..., AA=27, etc.)"""
-        result = 0
-        for char in letter:
-            result = result * 26 + (ord(char.upper()) - ord('A') + 1)
-        return result
+        return column_index_from_string(letter.upper())
     
     def _analyze_security(self, wb, data_analysis: Dict[str, Any]) -> Dict[str, Any]:
         """Comprehensive security analysis with pattern detection"""
@@ -1038,16 +1129,16 @@ class SimpleExcelAnalyzer:
         try:
             # Check formulas for external references
             for ws in wb.worksheets:
-                for row in ws.iter_rows(max_row=min(ws.max_row, 1000)):
-                    for cell in row:
-                        if cell.value and isinstance(cell.value, str) and cell.value.startswith('='):
-                            formula = str(cell.value)
+                for row in ws.iter_rows(max_row=min(ws.max_row, 1000), values_only=True):
+                    for value in row:
+                        if value and isinstance(value, str) and value.startswith('='):
+                            formula = value
                             # Look for external file references [filename]
                             if '[' in formula and ']' in formula:
                                 external_refs['has_external_refs'] = True
                                 external_refs['count'] += 1
                                 # Extract reference (simplified)
-                                matches = re.findall(r'\[([^\]]+)\]', formula)
+                                matches = _EXTERNAL_WORKBOOK_PATTERN.findall(formula)
                                 external_refs['references'].extend(matches)
         except:
             pass
@@ -1056,15 +1147,6 @@ class SimpleExcelAnalyzer:
     
     def _detect_sensitive_data_patterns(self, wb, data_analysis: Dict[str, Any]) -> Dict[str, Any]:
         """Detect sensitive data patterns using regex"""
-        patterns = {
-            'email_addresses': r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b',
-            'ssn_numbers': r'\b\d{3}-\d{2}-\d{4}\b|\b\d{9}\b',
-            'credit_cards': r'\b(?:\d{4}[-\s]?){3}\d{4}\b',
-            'phone_numbers': r'\b\(?\d{3}\)?[-\s]?\d{3}[-\s]?\d{4}\b',
-            'financial_amounts': r'\$[\d,]+\.?\d*',
-            'account_numbers': r'\b\d{8,}\b'
-        }
-        
         detected_patterns = {
             'patterns_found': False,
             'pattern_counts': {},
@@ -1077,28 +1159,21 @@ class SimpleExcelAnalyzer:
                 columns = sheet_data.get('columns', [])
                 for column in columns:
                     sample_values = column.get('sample_values', [])
-                    for value in sample_values:
-                        if isinstance(value, str):
-                            for pattern_name, pattern_regex in patterns.items():
-                                if re.search(pattern_regex, value):
-                                    detected_patterns['patterns_found'] = True
-                                    detected_patterns['pattern_counts'][pattern_name] = \
-                                        detected_patterns['pattern_counts'].get(pattern_name, 0) + 1
+                    # Samples repeat heavily in categorical columns; scan each
+                    # distinct value once and weight hits by its occurrences
+                    value_counts = Counter(value for value in sample_values if isinstance(value, str))
+                    for value, occurrences in value_counts.items():
+                        for pattern_name, pattern_regex in _SENSITIVE_DATA_PATTERNS.items():
+                            if pattern_regex.search(value):
+                                detected_patterns['patterns_found'] = True
+                                detected_patterns['pattern_counts'][pattern_name] = \
+                                    detected_patterns['pattern_counts'].get(pattern_name, 0) + occurrences
         except:
             pass
         
         # Calculate risk score based on patterns found
-        risk_weights = {
-            'ssn_numbers': 3.0,
-            'credit_cards': 3.0,
-            'account_numbers': 2.0,
-            'email_addresses': 1.0,
-            'phone_numbers': 1.0,
-            'financial_amounts': 0.5
-        }
-        
         for pattern_name, count in detected_patterns['pattern_counts'].items():
-            weight = risk_weights.get(pattern_name, 1.0)
+            weight = _SENSITIVE_RISK_WEIGHTS.get(pattern_name, 1.0)
             detected_patterns['risk_score'] += min(count * weight, 5.0)  # Cap at 5 per pattern
         
         return detected_patterns
@@ -1169,12 +1244,19 @@ class SimpleExcelAnalyzer:
             
             # Find relationships between sheets - comprehensive analysis
             sheet_names = list(sheet_analysis.keys())
+            # Lower-cased header sets are per sheet, not per pair; build each once
+            column_sets = {
+                name: {col['header'].lower() for col in sheet_analysis[name].get('columns', [])}
+                for name in sheet_names
+            }
+            # A sheet without columns can share none, so leave it out of the pairing
+            sheet_names = [name for name in sheet_names if column_sets[name]]
             
             # Check ALL possible pairs of sheets, not just adjacent ones
             for i, sheet1 in enumerate(sheet_names):
                 for j, sheet2 in enumerate(sheet_names):
                     if i != j:  # Don't compare sheet with itself
-                        relationship = self._find_sheet_relationship(sheet1, sheet2, sheet_analysis, potential_keys)
+                        relationship = self._find_sheet_relationship(sheet1, sheet2, sheet_analysis, potential_keys, column_sets)
                         if relationship:
                             relationships['relationships_found'].append(relationship)
         except Exception as e:
@@ -1184,15 +1266,21 @@ class SimpleExcelAnalyzer:
         
         return relationships
     
-    def _find_sheet_relationship(self, sheet1: str, sheet2: str, sheet_analysis: Dict, potential_keys: Dict) -> Optional[Dict]:
-        """Find relationship between two sheets"""
+    def _find_sheet_relationship(self, sheet1: str, sheet2: str, sheet_analysis: Dict, potential_keys: Dict,
+                                 column_sets: Optional[Dict[str, Set[str]]] = None) -> Optional[Dict]:
+        """Find relationship between two sheets; `column_sets` holds precomputed lower-cased headers per sheet"""
         try:
             keys1 = potential_keys.get(sheet1, [])
             keys2 = potential_keys.get(sheet2, [])
             
             # Simple heuristic: if sheets have similar column names, they might be related
-            sheet1_columns = {col['header'].lower() for col in sheet_analysis[sheet1].get('columns', [])}
-            sheet2_columns = {col['header'].lower() for col in sheet_analysis[sheet2].get('columns', [])}
+            if column_sets is None:
+                column_sets = {
+                    name: {col['header'].lower() for col in sheet_analysis[name].get('columns', [])}
+                    for name in (sheet1, sheet2)
+                }
+            sheet1_columns = column_sets[sheet1]
+            sheet2_columns = column_sets[sheet2]
             
             common_columns = sheet1_columns.intersection(sheet2_columns)
             
@@ -1202,12 +1290,11 @@ class SimpleExcelAnalyzer:
                 sorted_common = sorted(list(common_columns))
                 
                 # Find high-priority key columns
-                key_patterns = ['id', 'key', 'code', 'number', 'name', 'contractor', 'client']
                 high_priority_keys = []
                 other_keys = []
                 
                 for col_name in sorted_common:
-                    if any(keyword in col_name.lower() for keyword in key_patterns):
+                    if any(keyword in col_name.lower() for keyword in _KEY_COLUMN_PATTERNS):
                         high_priority_keys.append(col_name)
                     else:
                         other_keys.append(col_name)
@@ -1216,7 +1303,8 @@ class SimpleExcelAnalyzer:
                 all_common_keys = high_priority_keys + other_keys
                 
                 # Calculate match rate based on common columns vs total unique columns
-                total_unique_columns = len(sheet1_columns.union(sheet2_columns))
+                # (size of union = both sizes minus the overlap, without building the union set)
+                total_unique_columns = len(sheet1_columns) + len(sheet2_columns) - len(common_columns)
                 match_rate = len(common_columns) / max(total_unique_columns, 1)
                 
                 return {
@@ -1274,19 +1362,22 @@ class SimpleExcelAnalyzer:
     # ------------------------------------------------------------------
     def _analyze_data_boundaries(self, ws):
         """Return dict of true data boundaries and additional range metadata."""
-        # Determine last non-empty row scanning upward from bottom (limited for speed)
-        last_row = ws.max_row
-        while last_row > 1:
-            if any(cell.value not in (None, "", " ") for cell in ws[last_row]):
-                break
-            last_row -= 1
-
-        # Determine last non-empty column scanning leftward (sample first 200 rows)
-        last_col = ws.max_column
-        while last_col > 1:
-            if any(ws.cell(row=r, column=last_col).value not in (None, "", " ") for r in range(1, min(ws.max_row, 200))):
-                break
-            last_col -= 1
+        # Single streaming pass: random access (ws[row] / ws.cell) on a read-only
+        # worksheet re-parses the sheet XML on every call.
+        # Last non-empty row considers every row. Last non-empty column only
+        # looks at rows 1 .. min(max_row, 200) - 1, so on a sheet of 200 rows
+        # or fewer the final row never widens the column range (kept as-is to
+        # match the pre-existing sampling window).
+        last_row = 1
+        last_col = 1
+        col_sample_limit = min(ws.max_row, 200)
+        for row_idx, row in enumerate(ws.iter_rows(values_only=True), start=1):
+            non_empty = [col_idx for col_idx, value in enumerate(row, start=1) if value not in (None, "", " ")]
+            if not non_empty:
+                continue
+            last_row = row_idx
+            if row_idx < col_sample_limit and non_empty[-1] > last_col:
+                last_col = non_empty[-1]
 
         true_range = f"A1:{get_column_letter(last_col)}{last_row}"
         return {
@@ -1326,22 +1417,46 @@ class SimpleExcelAnalyzer:
     # ------------------------------------------------------------------
     def _map_sheet_dependencies(self, wb):
         """Return dict of sheet-to-sheet reference counts + circular flag."""
-        pattern = re.compile(r"'?([A-Za-z0-9 _]+)'?!")
         deps: Dict[str, Dict[str, int]] = {}
+        max_check = self.config.get('analysis', {}).get('max_formula_check', 1000)
         for ws in wb.worksheets:
             deps.setdefault(ws.title, {})
-            for row in ws.iter_rows(max_row=self.config.get('analysis', {}).get('max_formula_check', 1000)):
-                for cell in row:
-                    if cell.value and isinstance(cell.value, str) and cell.value.startswith('='):
-                        for m in pattern.finditer(cell.value):
+            for row in ws.iter_rows(max_row=max_check, values_only=True):
+                for value in row:
+                    if value and isinstance(value, str) and value.startswith('='):
+                        for m in _SHEET_REF_PATTERN.finditer(value):
                             target = m.group(1)
                             if target == ws.title:
                                 continue
                             deps[ws.title][target] = deps[ws.title].get(target, 0) + 1
         # Detect circular references
-        circular = any(start in deps.get(end, {}) for start in deps for end in deps[start])
+        circular = self._has_circular_dependency(deps)
         return {'dependency_matrix': deps, 'has_circular': circular}
 
+    def _has_circular_dependency(self, deps: Dict[str, Dict[str, int]]) -> bool:
+        """Return True if the sheet dependency graph has a cycle of any length (iterative DFS)."""
+        visiting: Set[str] = set()  # sheets on the current DFS path
+        done: Set[str] = set()      # sheets whose dependencies are fully explored
+        for root in deps:
+            if root in done:
+                continue
+            visiting.add(root)
+            stack = [(root, iter(deps[root]))]
+            while stack:
+                node, targets = stack[-1]
+                for target in targets:
+                    if target in visiting:
+                        return True
+                    if target not in done:
+                        visiting.add(target)
+                        stack.append((target, iter(deps.get(target, ()))))
+                        break
+                else:
+                    stack.pop()
+                    visiting.discard(node)
+                    done.add(node)
+        return False
+
     # ------------------------------------------------------------------
     # Task 6: Streaming data stats (very large sheets)
     # ------------------------------------------------------------------
@@ -1377,6 +1492,7 @@ class SimpleExcelAnalyzer:
             }
 
         # --- sample values (rows 2-11) ---------------------------------------
+        filled_columns = 0  # columns that already hold 10 samples
         for row in ws.iter_rows(min_row=2, max_row=11, values_only=True):
             for col_idx, value in enumerate(row, start=1):
                 if value in (None, "", " "):
@@ -1385,8 +1501,10 @@ class SimpleExcelAnalyzer:
                 samples = headers[col_letter]['sample_values']
                 if len(samples) < 10:
                     samples.append(str(value)[:50])  # truncate long strings
+                    if len(samples) == 10:
+                        filled_columns += 1
                 # early exit if all columns filled
-                if all(len(v['sample_values']) >= 10 for v in headers.values()):
+                if filled_columns == len(headers):
                     break
 
         return headers
@@ -1396,11 +1514,11 @@ class SimpleExcelAnalyzer:
         total_formulas = 0
         complex_formulas = []
         external_refs = False
+        max_check = self.config.get('analysis', {}).get('max_formula_check', 1000)
         
         for ws in wb.worksheets:
             # Sample check to avoid performance issues
             checked_cells = 0
-            max_check = self.config.get('analysis', {}).get('max_formula_check', 1000)
             
             for row in ws.iter_rows():
                 if checked_cells >= max_check:
@@ -1412,9 +1530,10 @@ class SimpleExcelAnalyzer:
                     
                     checked_cells += 1
                     
-                    if cell.value and isinstance(cell.value, str) and cell.value.startswith('='):
+                    # Read the cell value once; it is already a str when it holds a formula
+                    formula = cell.value
+                    if formula and isinstance(formula, str) and formula.startswith('='):
                         total_formulas += 1
-                        formula = str(cell.value)
                         
                         # Check complexity
                         if len(formula) > 50 or formula.count('(') > 3:
@@ -1518,6 +1637,7 @@ class SimpleExcelAnalyzer:
         successful_modules = sum(1 for s in module_statuses.values() if s == 'success')
         total_modules = len(module_statuses)
         success_rate = successful_modules / max(1, total_modules)
+        total_module_time = sum(module_timings.values())
         
         return {
             'file_info': file_info,
@@ -1553,8 +1673,8 @@ class SimpleExcelAnalyzer:
                 'success_rate': success_rate,
                 'module_statuses': module_statuses,
                 'module_timings': module_timings,
-                'total_module_time': sum(module_timings.values()),
-                'average_module_time': sum(module_timings.values()) / len(module_timings) if module_timings else 0
+                'total_module_time': total_module_time,
+                'average_module_time': total_module_time / len(module_timings) if module_timings else 0
             },
             'resource_usage': {
                 'current_usage': {
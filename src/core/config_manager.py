@@ -9,6 +9,28 @@ import yaml
 from typing import Dict, Any, Optional
 from pathlib import Path
 
+# Prefer the libyaml-backed loader when PyYAML was built with it
+try:
+    from yaml import CSafeLoader as _SafeLoader
+except ImportError:
+    from yaml import SafeLoader as _SafeLoader
+
+# (min, max) bounds for numeric settings, keyed by config path
+_NUMERIC_CONSTRAINTS = {
+    ('analysis', 'sample_rows'): (1, 10000),
+    ('analysis', 'max_formula_check'): (1, 100000),
+    ('analysis', 'memory_limit_mb'): (64, 8192),
+    ('analysis', 'timeout_per_sheet_seconds'): (1, 3600),
+    ('performance', 'chunk_size'): (1, 100000),
+    ('performance', 'timeout_seconds'): (1, 7200),
+}
+
+# Allowed values for string settings, keyed by config path
+_VALID_CHOICES = {
+    ('analysis', 'detail_level'): ('basic', 'standard', 'comprehensive'),
+    ('logging', 'level'): ('DEBUG', 'INFO', 'WARNING', 'ERROR', 'CRITICAL'),
+}
+
 
 class ConfigManager:
     """
@@ -105,7 +127,7 @@ class ConfigManager:
             config_file = Path(config_path)
             if config_file.exists():
                 with open(config_file, 'r', encoding='utf-8') as f:
-                    config = yaml.safe_load(f) or {}
+                    config = yaml.load(f, Loader=_SafeLoader) or {}
                 print(f"Configuration loaded from: {config_file}")
                 return self._merge_with_defaults(config)
             else:
@@ -241,16 +263,7 @@ class ConfigManager:
     def _validate_config(self):
         """Validate configuration values and apply constraints"""
         # Ensure numeric values are within reasonable bounds
-        constraints = {
-            ('analysis', 'sample_rows'): (1, 10000),
-            ('analysis', 'max_formula_check'): (1, 100000),
-            ('analysis', 'memory_limit_mb'): (64, 8192),
-            ('analysis', 'timeout_per_sheet_seconds'): (1, 3600),
-            ('performance', 'chunk_size'): (1, 100000),
-            ('performance', 'timeout_seconds'): (1, 7200),
-        }
-        
-        for path, (min_val, max_val) in constraints.items():
+        for path, (min_val, max_val) in _NUMERIC_CONSTRAINTS.items():
             value = self.get('.'.join(path))
             if value is not None and isinstance(value, (int, float)):
                 if value < min_val:
@@ -261,12 +274,7 @@ class ConfigManager:
                     self._set_nested_value(self._config, list(path), max_val)
         
         # Validate string choices
-        valid_choices = {
-            ('analysis', 'detail_level'): ['basic', 'standard', 'comprehensive'],
-            ('logging', 'level'): ['DEBUG', 'INFO', 'WARNING', 'ERROR', 'CRITICAL'],
-        }
-        
-        for path, choices in valid_choices.items():
+        for path, choices in _VALID_CHOICES.items():
             value = self.get('.'.join(path))
             if value is not None and value not in choices:
                 print(f"Warning: Invalid config value {'.'.join(path)}={value}, using default")
@@ -10,6 +10,13 @@ from datetime import datetime
 import json
 
 
+# Top-level sections every report expects; missing ones get fallbacks
+_REQUIRED_SECTIONS = (
+    'file_info', 'analysis_metadata', 'module_results',
+    'execution_summary', 'recommendations'
+)
+
+
 class ReportDataModel:
     """
     Unified data model ensuring all reports contain the same information
@@ -25,12 +32,7 @@ class ReportDataModel:
     
     def _validate_completeness(self):
         """Ensure all required sections exist with fallbacks"""
-        required_sections = [
-            'file_info', 'analysis_metadata', 'module_results', 
-            'execution_summary', 'recommendations'
-        ]
-        
-        for section in required_sections:
+        for section in _REQUIRED_SECTIONS:
             if section not in self.raw_results:
                 self.raw_results[section] = self._get_fallback(section)
     
@@ -168,13 +170,6 @@ class ReportDataModel:
             'sheet_analysis': data_profiler.get('sheet_analysis', {}),
             'overall_metrics': data_profiler.get('overall_metrics', {})
         }
-        
-        return {
-            'sheet_analysis': data_profiler.get('sheet_analysis', {}),
-            'data_type_distribution': data_profiler.get('data_type_distribution', {}),
-            'overall_metrics': data_profiler.get('overall_metrics', {}),
-            'cross_sheet_analysis': data_profiler.get('cross_sheet_analysis', {})
-        }
     
     def _extract_sheet_details(self) -> List[Dict[str, Any]]:
         """Extract standardized sheet details"""
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Unit tests for SimpleExcelAnalyzer helper methods
+Exercises the helpers against read-only workbooks, as used by analyze()
+"""
+
+import sys
+import os
+import tempfile
+import itertools
+from unittest import mock
+from datetime import datetime
+from pathlib import Path
+import openpyxl
+
+# Add src to path so we can import modules
+src_path = Path(__file__).parent.parent / "src"
+sys.path.insert(0, str(src_path))
+
+from core import SimpleExcelAnalyzer
+
+
+def create_boundaries_file() -> str:
+    """Create a workbook with trailing blank rows and a sparse last column"""
+    with tempfile.NamedTemporaryFile(suffix='.xlsx', delete=False) as tmp:
+        wb = openpyxl.Workbook()
+        ws = wb.active
+        ws.title = "Data"
+        ws.append(["Name", "Age", None])
+        ws.append(["Alice", 25, None])
+        ws.append(["Bob", 30, "note"])
+        # Formatted-but-empty cells extend the declared dimensions
+        ws.cell(row=8, column=5, value=" ")
+        wb.save(tmp.name)
+        return tmp.name
+
+
+def test_data_boundaries_read_only():
+    """True range ignores blank trailing rows and columns"""
+    test_file = create_boundaries_file()
+    try:
+        analyzer = SimpleExcelAnalyzer('config.yaml')
+        wb = openpyxl.load_workbook(test_file, data_only=True, read_only=True)
+        boundaries = analyzer._analyze_data_boundaries(wb["Data"])
+        wb.close()
+
+        assert boundaries['declared_range'] == 'A1:E8'
+        assert boundaries['true_range'] == 'A1:C3'
+    finally:
+        try:
+            os.unlink(test_file)
+        except:
+            pass
+
+
+def test_column_stats_timeout_small_sample():
+    """The per-sheet timeout fires even when the sample is only a few rows"""
+    with tempfile.NamedTemporaryFile(suffix='.xlsx', delete=False) as tmp:
+        test_file = tmp.name
+    try:
+        wb = openpyxl.Workbook()
+        for i in range(50):
+            wb.active.append([i, f"row {i}"])
+        wb.save(test_file)
+
+        analyzer = SimpleExcelAnalyzer('config.yaml')
+        wb = openpyxl.load_workbook(test_file, data_only=True, read_only=True)
+        # Fake clock advancing one second per call
+        ticks = itertools.count()
+        with mock.patch('core.analyzer.time.time', side_effect=lambda: float(next(ticks))):
+            try:
+                analyzer._compute_enhanced_column_stats(wb.active, max_rows=50, timeout_sec=10)
+            except TimeoutError:
+                pass
+            else:
+                raise AssertionError("expected TimeoutError on a 50-row sample")
+        wb.close()
+    finally:
+        try:
+            os.unlink(test_file)
+        except:
+            pass
+
+
+def test_detect_outliers():
+    """IQR outliers are reported in input order"""
+    analyzer = SimpleExcelAnalyzer('config.yaml')
+    values = [10, 12, 11, 13, 12, 500, 11, -300, 12]
+    
+    assert analyzer._detect_outliers(values) == [500, -300]
+    assert analyzer._detect_outliers([1, 2, 3]) == []
+
+
+def test_detect_duplicate_rows_keys():
+    """Duplicates compare stringified values, so 1, 1.0 and True differ"""
+    analyzer = SimpleExcelAnalyzer('config.yaml')
+
+    def count(rows):
+        return analyzer._detect_duplicate_rows(None, len(rows), rows=rows)['count']
+
+    assert count([(1, "a"), (1, "a"), (2, "b")]) == 1
+    assert count([(1,), (True,), (1,)]) == 1
+    assert count([(1,), (1.0,)]) == 0
+    assert count([(None,), ("",)]) == 1
+
+
+def test_detect_enhanced_cell_type():
+    """Cell values map to the expected type categories"""
+    analyzer = SimpleExcelAnalyzer('config.yaml')
+    detect = analyzer._detect_enhanced_cell_type
+
+    assert detect(None) == 'blank'
+    assert detect("  ") == 'blank'
+    assert detect(42) == 'numeric'
+    assert detect(3.5) == 'numeric'
+    assert detect(True) == 'numeric'
+    assert detect(datetime(2024, 1, 31)) == 'date'
+    assert detect("=SUM(A1:A3)") == 'formula'
+    assert detect("#N/A") == 'error'
+    assert detect("2024-01-31") == 'date'
+    assert detect("$1,250") == 'numeric'
+    assert detect("hello") == 'text'
+
+
+def test_sensitive_patterns_count_repeated_samples():
+    """Each occurrence of a repeated sample value counts towards its pattern"""
+    analyzer = SimpleExcelAnalyzer('config.yaml')
+    data_analysis = {'sheet_analysis': {'Contacts': {'columns': [
+        {'sample_values': ['a@example.com', 'a@example.com', 'n/a', 'a@example.com', 42]}
+    ]}}}
+
+    result = analyzer._detect_sensitive_data_patterns(None, data_analysis)
+    assert result['patterns_found']
+    assert result['pattern_counts'] == {'email_addresses': 3}
+    assert result['risk_score'] == 3.0
+
+
+def test_circular_dependency_detection():
+    """Sheet cycles are found at any length; acyclic chains are not flagged"""
+    analyzer = SimpleExcelAnalyzer('config.yaml')
+
+    assert analyzer._has_circular_dependency({'A': {'B': 1}, 'B': {'A': 2}})
+    assert analyzer._has_circular_dependency({'A': {'B': 1}, 'B': {'C': 1}, 'C': {'A': 1}})
+    assert not analyzer._has_circular_dependency({'A': {'B': 1, 'C': 1}, 'B': {'C': 1}, 'C': {}})
+    # References to sheets outside the workbook are leaves, not errors
+    assert not analyzer._has_circular_dependency({'A': {'External': 1}})
+
+
+def test_map_sheet_dependencies_three_sheet_cycle():
+    """A -> B -> C -> A formula chain is reported as circular"""
+    with tempfile.NamedTemporaryFile(suffix='.xlsx', delete=False) as tmp:
+        test_file = tmp.name
+    try:
+        wb = openpyxl.Workbook()
+        wb.active.title = "A"
+        wb.create_sheet("B")
+        wb.create_sheet("C")
+        wb["A"]["A1"] = "=B!A1"
+        wb["B"]["A1"] = "=C!A1"
+        wb["C"]["A1"] = "=A!A1+1"
+        wb.save(test_file)
+
+        analyzer = SimpleExcelAnalyzer('config.yaml')
+        wb = openpyxl.load_workbook(test_file, read_only=True)
+        result = analyzer._map_sheet_dependencies(wb)
+        wb.close()
+
+        assert result['dependency_matrix'] == {'A': {'B': 1}, 'B': {'C': 1}, 'C': {'A': 1}}
+        assert result['has_circular']
+    finally:
+        try:
+            os.unlink(test_file)
+        except:
+            pass
+
+
+if __name__ == "__main__":
+    test_data_boundaries_read_only()
+    test_column_stats_timeout_small_sample()
+    test_detect_outliers()
+    test_detect_duplicate_rows_keys()
+    test_detect_enhanced_cell_type()
+    test_sensitive_patterns_count_repeated_samples()
+    test_circular_dependency_detection()
+    test_map_sheet_dependencies_three_sheet_cycle()
+    print("PASS: analyzer helper tests")